@@ -1,4 +1,3 @@
-import asyncio
 import json
 import os
 import pathlib
@@ -132,7 +131,7 @@ def get_github_repository() -> str | None:
     "-s",
     help="Head SHA of the triggered job",
     required=True,
-    default=lambda: asyncio.run(get_head_sha()),
+    default=lambda: utils.run_coroutine(get_head_sha()),
 )
 @click.option(
     "--job-name",
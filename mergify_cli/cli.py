@@ -20,6 +20,7 @@ import click.decorators
 import click_default_group
 
 from mergify_cli import VERSION
+from mergify_cli import utils
 from mergify_cli.ci import cli as ci_cli_mod
 from mergify_cli.stack import cli as stack_cli_mod
 
@@ -37,6 +38,7 @@ def cli(
     debug: bool,
 ) -> None:
     ctx.obj = {"debug": debug}
+    utils.set_debug(debug)
 
 
 cli.add_command(stack_cli_mod.stack)
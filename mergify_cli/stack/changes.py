@@ -215,6 +215,27 @@ def display_plan(
         console.log(orphan.get_log_from_orphan_change(dry_run=True))
 
 
+async def get_local_commits(
+    base_commit_sha: str,
+    dest_branch: str,
+) -> list[tuple[str, str, str]]:
+    # NOTE: retrieve all commits of the stack, oldest first, with a single git
+    # call; records are separated by \x1e and fields by \x00
+    log = await utils.git(
+        "log",
+        "--reverse",
+        "--format=%H%x00%s%x00%b%x1e",
+        f"{base_commit_sha}..{dest_branch}",
+    )
+    commits = []
+    for record in log.split("\x1e"):
+        if not record.strip():
+            continue
+        sha, title, message = record.lstrip("\n").split("\x00", 2)
+        commits.append((sha, title, message.strip()))
+    return commits
+
+
 async def get_changes(  # noqa: PLR0913,PLR0917
     base_commit_sha: str,
     stack_prefix: str,
@@ -224,28 +245,11 @@ async def get_changes(  # noqa: PLR0913,PLR0917
     only_update_existing_pulls: bool,
     next_only: bool,
 ) -> Changes:
-    commits = (
-        commit
-        for commit in reversed(
-            (
-                await utils.git(
-                    "log",
-                    "--format=%H",
-                    f"{base_commit_sha}..{dest_branch}",
-                )
-            ).split(
-                "\n",
-            ),
-        )
-        if commit
-    )
     changes = Changes(stack_prefix)
     remaining_remote_changes = remote_changes.copy()
 
-    for idx, commit in enumerate(commits):
-        message = await utils.git("log", "-1", "--format=%b", commit)
-        title = await utils.git("log", "-1", "--format=%s", commit)
-
+    commits = await get_local_commits(base_commit_sha, dest_branch)
+    for idx, (commit, title, message) in enumerate(commits):
         changeids = CHANGEID_RE.findall(message)
         if not changeids:
             console.print(
@@ -26,17 +26,16 @@ async def stack_checkout(  # noqa: PLR0913, PLR0917
     trunk: tuple[str, str],
     dry_run: bool,
 ) -> None:
-    if author is None:
-        async with utils.get_github_http_client(github_server, token) as client:
+    async with utils.get_github_http_client(github_server, token) as client:
+        if author is None:
             r_author = await client.get("/user")
             author = r_author.json()["login"]
 
-    if branch_prefix is None:
-        branch_prefix = await utils.get_default_branch_prefix(author)
+        if branch_prefix is None:
+            branch_prefix = await utils.get_default_branch_prefix(author)
 
-    stack_branch = f"{branch_prefix}/{branch}" if branch_prefix else branch
+        stack_branch = f"{branch_prefix}/{branch}" if branch_prefix else branch
 
-    async with utils.get_github_http_client(github_server, token) as client:
         with console.status("Retrieving latest pushed stacks"):
             remote_changes = await changes.get_remote_changes(
                 client,
@@ -93,3 +92,5 @@ async def stack_checkout(  # noqa: PLR0913, PLR0917
         await utils.git("fetch", remote, node.pull["head"]["ref"])
         await utils.git("checkout", "-b", branch, head_ref)
         await utils.git("branch", f"--set-upstream-to={upstream}")
+        # NOTE: the git configuration just changed, drop the cached one
+        utils.clear_git_config_cache()
@@ -1,4 +1,3 @@
-import asyncio
 import os
 from urllib import parse
 
@@ -30,7 +29,7 @@ def trunk_type(
 
 async def get_default_github_server() -> str:
     try:
-        result = await utils.git("config", "--get", "mergify-cli.github-server")
+        result = await utils.git_get_config_value("mergify-cli.github-server")
     except utils.CommandError:
         result = ""
 
@@ -54,8 +53,6 @@ async def get_default_token() -> str:
                 "error: please make sure that gh client is installed and you are authenticated, or set the "
                 "'GITHUB_TOKEN' environment variable",
             )
-    if utils.is_debug():
-        console.print(f"[purple]DEBUG: token: {token}[/]")
     return token
 
 
@@ -79,13 +76,13 @@ stack = click_default_group.DefaultGroup(
     params=[
         click.Option(
             param_decls=["--token"],
-            default=lambda: asyncio.run(get_default_token()),
+            default=lambda: utils.run_coroutine(get_default_token()),
             help="GitHub personal access token",
             callback=token_to_context,
         ),
         click.Option(
             param_decls=["--github-server"],
-            default=lambda: asyncio.run(get_default_github_server()),
+            default=lambda: utils.run_coroutine(get_default_github_server()),
             help="GitHub API server",
             callback=github_server_to_context,
         ),
@@ -137,7 +134,7 @@ async def edit() -> None:
     is_flag=True,
     # NOTE: `flag_value` here is used to allow the default's lazy loading with `is_flag`
     flag_value=True,
-    default=lambda: asyncio.run(utils.get_default_keep_pr_title_body()),
+    default=lambda: utils.run_coroutine(utils.get_default_keep_pr_title_body()),
     help="Don't update the title and body of already opened pull requests. "
     "Default fetched from git config if added with `git config --add mergify-cli.stack-keep-pr-title-body true`",
 )
@@ -149,7 +146,7 @@ async def edit() -> None:
     "--trunk",
     "-t",
     type=click.UNPROCESSED,
-    default=lambda: asyncio.run(utils.get_trunk()),
+    default=lambda: utils.run_coroutine(utils.get_trunk()),
     callback=trunk_type,
     help="Change the target branch of the stack.",
 )
@@ -230,7 +227,7 @@ async def push(  # noqa: PLR0913, PLR0917
     "--trunk",
     "-t",
     type=click.UNPROCESSED,
-    default=lambda: asyncio.run(utils.get_trunk()),
+    default=lambda: utils.run_coroutine(utils.get_trunk()),
     callback=trunk_type,
     help="Change the target branch of the stack.",
 )
@@ -64,6 +64,8 @@ async def stack_github_action_auto_rebase(github_server: str, token: str) -> Non
         f"{author}@users.noreply.github.com",
     )
     await utils.git("branch", "--set-upstream-to", f"origin/{base}")
+    # NOTE: the git configuration just changed, drop the cached one
+    utils.clear_git_config_cache()
 
     await checkout.stack_checkout(
         github_server,
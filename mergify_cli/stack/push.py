@@ -32,7 +32,6 @@ if typing.TYPE_CHECKING:
     import httpx
 
 DEPENDS_ON_RE = re.compile(r"Depends-On: (#[0-9]*)")
-TMP_STACK_BRANCH = "mergify-cli-tmp"
 
 
 @dataclasses.dataclass
@@ -81,65 +80,68 @@ async def stack_push(  # noqa: PLR0912, PLR0913, PLR0915, PLR0917, PLR0914
     os.chdir(await utils.git("rev-parse", "--show-toplevel"))
     dest_branch = await utils.git_get_branch_name()
 
-    if author is None:
-        async with utils.get_github_http_client(github_server, token) as client:
+    async with utils.get_github_http_client(github_server, token) as client:
+        if author is None:
             r_author = await client.get("/user")
             author = r_author.json()["login"]
 
-    if branch_prefix is None:
-        branch_prefix = await utils.get_default_branch_prefix(author)
+        if branch_prefix is None:
+            branch_prefix = await utils.get_default_branch_prefix(author)
 
-    try:
-        check_local_branch(branch_name=dest_branch, branch_prefix=branch_prefix)
-    except LocalBranchInvalidError as e:
-        console.log(f"[red] {e.message} [/]")
-        console.log(
-            "You should run `mergify stack` on the branch you created in the first place",
-        )
-        sys.exit(1)
+        try:
+            check_local_branch(branch_name=dest_branch, branch_prefix=branch_prefix)
+        except LocalBranchInvalidError as e:
+            console.log(f"[red] {e.message} [/]")
+            console.log(
+                "You should run `mergify stack` on the branch you created in the first place",
+            )
+            sys.exit(1)
 
-    remote, base_branch = trunk
+        remote, base_branch = trunk
 
-    user, repo = utils.get_slug(
-        await utils.git("config", "--get", f"remote.{remote}.url"),
-    )
+        user, repo = utils.get_slug(
+            await utils.git_get_config_value(f"remote.{remote}.url"),
+        )
+
+        if base_branch == dest_branch:
+            remote_url = await utils.git("remote", "get-url", remote)
+            console.print(
+                f"Your local branch `{dest_branch}` targets itself: `{remote}/{base_branch}` (at {remote_url}@{base_branch}).\n"
+                f"You should either fix the target branch or rename your local branch.\n\n"
+                f"* To fix the target branch: `git branch {dest_branch} --set-upstream-to={remote}/main>\n",
+                f"* To rename your local branch: `git branch -M {dest_branch} new-branch-name`",
+                style="red",
+            )
+            sys.exit(1)
 
-    if base_branch == dest_branch:
-        remote_url = await utils.git("remote", "get-url", remote)
-        console.print(
-            f"Your local branch `{dest_branch}` targets itself: `{remote}/{base_branch}` (at {remote_url}@{base_branch}).\n"
-            f"You should either fix the target branch or rename your local branch.\n\n"
-            f"* To fix the target branch: `git branch {dest_branch} --set-upstream-to={remote}/main>\n",
-            f"* To rename your local branch: `git branch -M {dest_branch} new-branch-name`",
-            style="red",
+        stack_prefix = (
+            f"{branch_prefix}/{dest_branch}" if branch_prefix else dest_branch
         )
-        sys.exit(1)
-
-    stack_prefix = f"{branch_prefix}/{dest_branch}" if branch_prefix else dest_branch
-
-    if not dry_run:
-        if skip_rebase:
-            console.log(f"branch `{dest_branch}` rebase skipped (--skip-rebase)")
-        else:
-            with console.status(
-                f"Rebasing branch `{dest_branch}` on `{remote}/{base_branch}`...",
-            ):
-                await utils.git("pull", "--rebase", remote, base_branch)
-            console.log(f"branch `{dest_branch}` rebased on `{remote}/{base_branch}`")
-
-    base_commit_sha = await utils.git(
-        "merge-base",
-        "--fork-point",
-        f"{remote}/{base_branch}",
-    )
-    if not base_commit_sha:
-        console.log(
-            f"Common commit between `{remote}/{base_branch}` and `{dest_branch}` branches not found",
-            style="red",
+
+        if not dry_run:
+            if skip_rebase:
+                console.log(f"branch `{dest_branch}` rebase skipped (--skip-rebase)")
+            else:
+                with console.status(
+                    f"Rebasing branch `{dest_branch}` on `{remote}/{base_branch}`...",
+                ):
+                    await utils.git("pull", "--rebase", remote, base_branch)
+                console.log(
+                    f"branch `{dest_branch}` rebased on `{remote}/{base_branch}`",
+                )
+
+        base_commit_sha = await utils.git(
+            "merge-base",
+            "--fork-point",
+            f"{remote}/{base_branch}",
         )
-        sys.exit(1)
+        if not base_commit_sha:
+            console.log(
+                f"Common commit between `{remote}/{base_branch}` and `{dest_branch}` branches not found",
+                style="red",
+            )
+            sys.exit(1)
 
-    async with utils.get_github_http_client(github_server, token) as client:
         with console.status("Retrieving latest pushed stacks"):
             remote_changes = await changes.get_remote_changes(
                 client,
@@ -172,6 +174,8 @@ async def stack_push(  # noqa: PLR0912, PLR0913, PLR0915, PLR0917, PLR0914
 
         console.log("Updating and/or creating stacked pull requests:", style="green")
 
+        await push_stacked_branches(remote, planned_changes.locals)
+
         pulls_to_comment: list[github_types.PullRequest] = []
         for change in planned_changes.locals:
             depends_on = pulls_to_comment[-1] if pulls_to_comment else None
@@ -181,7 +185,6 @@ async def stack_push(  # noqa: PLR0912, PLR0913, PLR0915, PLR0917, PLR0914
                     client,
                     user,
                     repo,
-                    remote,
                     change,
                     depends_on,
                     create_as_draft,
@@ -245,30 +248,59 @@ async def create_or_update_comments(
     pulls: list[github_types.PullRequest],
 ) -> None:
     stack_comment = StackComment(pulls)
+    open_pulls = [pull for pull in pulls if not pull["merged_at"]]
 
-    for pull in pulls:
-        if pull["merged_at"]:
-            continue
-
-        new_body = stack_comment.body(pull)
-
-        r = await client.get(f"/repos/{user}/{repo}/issues/{pull['number']}/comments")
-        comments = typing.cast("list[github_types.Comment]", r.json())
-        for comment in comments:
-            if StackComment.is_stack_comment(comment):
-                if comment["body"] != new_body:
-                    await client.patch(comment["url"], json={"body": new_body})
-                break
-        else:
-            # NOTE(charly): dont't create a stack comment if there is only one
-            # pull, it's not a stack
-            if len(pulls) == 1:
-                continue
-
-            await client.post(
-                f"/repos/{user}/{repo}/issues/{pull['number']}/comments",
-                json={"body": new_body},
-            )
+    # NOTE: only the comments are read concurrently, GitHub asks for write
+    # requests to be done one after another to avoid secondary rate limits
+    pulls_comments = await asyncio.gather(
+        *(get_comments(client, user, repo, pull) for pull in open_pulls),
+    )
+    for pull, comments in zip(open_pulls, pulls_comments, strict=True):
+        await create_or_update_comment(
+            client,
+            user,
+            repo,
+            stack_comment,
+            pull,
+            comments,
+        )
+
+
+async def get_comments(
+    client: httpx.AsyncClient,
+    user: str,
+    repo: str,
+    pull: github_types.PullRequest,
+) -> list[github_types.Comment]:
+    r = await client.get(f"/repos/{user}/{repo}/issues/{pull['number']}/comments")
+    return typing.cast("list[github_types.Comment]", r.json())
+
+
+async def create_or_update_comment(  # noqa: PLR0913,PLR0917
+    client: httpx.AsyncClient,
+    user: str,
+    repo: str,
+    stack_comment: StackComment,
+    pull: github_types.PullRequest,
+    comments: list[github_types.Comment],
+) -> None:
+    new_body = stack_comment.body(pull)
+
+    for comment in comments:
+        if StackComment.is_stack_comment(comment):
+            if comment["body"] != new_body:
+                await client.patch(comment["url"], json={"body": new_body})
+            return
+
+    # NOTE(charly): dont't create a stack comment if there is only one
+    # pull, it's not a stack
+    if len(stack_comment.pulls) == 1:
+        return
+
+    await client.post(
+        f"/repos/{user}/{repo}/issues/{pull['number']}/comments",
+        json={"body": new_body},
+    )
 
 
 async def delete_stack(
@@ -284,33 +316,32 @@ async def delete_stack(
     console.log(change.get_log_from_orphan_change(dry_run=False))
 
 
+async def push_stacked_branches(
+    remote: str,
+    local_changes: list[changes.LocalChange],
+) -> None:
+    refspecs = [
+        f"{change.commit_sha}:refs/heads/{change.dest_branch}"
+        for change in local_changes
+        if change.action in {"create", "update"}
+    ]
+    if not refspecs:
+        return
+
+    # NOTE: all branches are pushed at once to spawn a single git process
+    with console.status(f"* pushing {len(refspecs)} stacked branch(es)"):
+        await utils.git("push", "-f", remote, *refspecs)
+
+
 async def create_or_update_stack(  # noqa: PLR0913,PLR0917
     client: httpx.AsyncClient,
     user: str,
     repo: str,
-    remote: str,
     change: changes.LocalChange,
     depends_on: github_types.PullRequest | None,
     create_as_draft: bool,
     keep_pull_request_title_and_body: bool,
 ) -> github_types.PullRequest:
-    if change.pull is None:
-        status_message = f"* creating stacked branch `{change.dest_branch}` ({change.commit_short_sha})"
-    else:
-        status_message = f"* updating stacked branch `{change.dest_branch}` ({change.commit_short_sha}) - {change.pull['html_url'] if change.pull else '<stack branch without associated pull>'})"
-
-    with console.status(status_message):
-        await utils.git("branch", TMP_STACK_BRANCH, change.commit_sha)
-        try:
-            await utils.git(
-                "push",
-                "-f",
-                remote,
-                TMP_STACK_BRANCH + ":" + change.dest_branch,
-            )
-        finally:
-            await utils.git("branch", "-D", TMP_STACK_BRANCH)
-
     if change.action == "update":
         if change.pull is None:
             msg = "Can't update pull with change.pull unset"
@@ -12,16 +12,44 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from collections.abc import Generator
+import asyncio
 import pathlib
+import shutil
 import subprocess
-from unittest import mock
+import sys
 
 import pytest
+import pytest_asyncio
 
+from mergify_cli import utils
 from mergify_cli.tests import utils as test_utils
 
 
+# NOTE: pytest-asyncio still creates its loops through a policy. Event loop
+# policies are deprecated since Python 3.14, only use one before that.
+if sys.platform != "win32" and sys.version_info < (3, 14):
+    import uvloop
+
+    class UvloopEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+        def new_event_loop(self) -> asyncio.AbstractEventLoop:  # noqa: PLR6301
+            return uvloop.new_event_loop()
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    if sys.platform == "win32" or sys.version_info >= (3, 14):
+        return asyncio.get_event_loop_policy()
+    return UvloopEventLoopPolicy()
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    # Run all async tests in the same event loop
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
 @pytest.fixture(autouse=True)
 def _unset_github_token(
     monkeypatch: pytest.MonkeyPatch,
@@ -30,6 +58,13 @@ def _unset_github_token(
 
 
 @pytest.fixture(autouse=True)
+def _clear_git_config_cache() -> None:
+    # The git configuration is cached for the whole process, each test has its
+    # own repository
+    utils.clear_git_config_cache()
+
+
+@pytest.fixture
 def _change_working_directory(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: pathlib.Path,
@@ -39,41 +74,57 @@ def _change_working_directory(
     monkeypatch.chdir(tmp_path)
 
 
+@pytest.fixture(scope="session")
+def _git_repo_template(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    # Initialize the repository once, tests get a copy of it
+    repo = tmp_path_factory.mktemp("git_repo_template")
+    for command in (
+        ["git", "init", "--initial-branch=main"],
+        ["git", "config", "user.email", "test@example.com"],
+        ["git", "config", "user.name", "Test User"],
+        ["git", "commit", "--allow-empty", "-m", "Initial commit"],
+        ["git", "config", "--add", "branch.main.merge", "refs/heads/main"],
+        ["git", "config", "--add", "branch.main.remote", "origin"],
+    ):
+        subprocess.call(command, cwd=repo)
+    return repo
+
+
 @pytest.fixture
-def _git_repo() -> None:
-    subprocess.call(["git", "init", "--initial-branch=main"])
-    subprocess.call(["git", "config", "user.email", "test@example.com"])
-    subprocess.call(["git", "config", "user.name", "Test User"])
-    subprocess.call(["git", "commit", "--allow-empty", "-m", "Initial commit"])
-    subprocess.call(["git", "config", "--add", "branch.main.merge", "refs/heads/main"])
-    subprocess.call(["git", "config", "--add", "branch.main.remote", "origin"])
+def _git_repo(
+    _change_working_directory: None,
+    _git_repo_template: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    shutil.copytree(_git_repo_template, tmp_path, dirs_exist_ok=True)
+
+
+@pytest.fixture(scope="session")
+def _git_mock_template() -> test_utils.GitMock:
+    git_mock_object = test_utils.GitMock()
+    # URL of the GitHub repository
+    git_mock_object.mock_config({"remote.origin.url": "https://github.com/user/repo"})
+    git_mock_object.mock_many(
+        {
+            # Name of the current branch
+            ("rev-parse", "--abbrev-ref", "HEAD"): "current-branch",
+            # Mock pull command
+            ("pull", "--rebase", "origin", "main"): "",
+        },
+    )
+    return git_mock_object
 
 
 @pytest.fixture
 def git_mock(
+    _change_working_directory: None,
+    monkeypatch: pytest.MonkeyPatch,
     tmp_path: pathlib.Path,
-) -> Generator[test_utils.GitMock, None, None]:
-    git_mock_object = test_utils.GitMock()
+    _git_mock_template: test_utils.GitMock,
+) -> test_utils.GitMock:
+    git_mock_object = _git_mock_template.clone()
     # Top level directory is a temporary path
     git_mock_object.mock("rev-parse", "--show-toplevel", output=str(tmp_path))
-    # Name of the current branch
-    git_mock_object.mock("rev-parse", "--abbrev-ref", "HEAD", output="current-branch")
-    # URL of the GitHub repository
-    git_mock_object.mock(
-        "config",
-        "--get",
-        "remote.origin.url",
-        output="https://github.com/user/repo",
-    )
-    # Mock pull and push commands
-    git_mock_object.mock("pull", "--rebase", "origin", "main", output="")
-    git_mock_object.mock(
-        "push",
-        "-f",
-        "origin",
-        "current-branch:current-branch/aio",
-        output="",
-    )
 
-    with mock.patch("mergify_cli.utils.git", git_mock_object):
-        yield git_mock_object
+    monkeypatch.setattr(utils, "git", git_mock_object)
+    return git_mock_object
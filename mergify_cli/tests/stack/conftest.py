@@ -0,0 +1,42 @@
+#
+#  Copyright © 2021-2024 Mergify SAS
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from collections.abc import Generator
+
+import pytest
+import respx
+
+
+@pytest.fixture(scope="package")
+def _github_respx_router() -> Generator[respx.MockRouter, None, None]:
+    # NOTE: the router and the httpx transport patching are set up once for
+    # the whole package, each test only adds and rolls back its own routes
+    with respx.mock(
+        base_url="https://api.github.com/",
+        assert_all_called=False,
+    ) as router:
+        yield router
+
+
+@pytest.fixture
+def respx_mock(
+    _github_respx_router: respx.MockRouter,
+) -> Generator[respx.MockRouter, None, None]:
+    _github_respx_router.snapshot()
+    try:
+        yield _github_respx_router
+        _github_respx_router.assert_all_called()
+    finally:
+        _github_respx_router.rollback()
+        _github_respx_router.reset()
@@ -0,0 +1,38 @@
+#
+#  Copyright © 2021-2024 Mergify SAS
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import pytest
+
+from mergify_cli import utils
+from mergify_cli.stack import changes
+
+
+@pytest.mark.usefixtures("_git_repo")
+async def test_get_local_commits() -> None:
+    base_commit_sha = await utils.git("rev-parse", "HEAD")
+    messages = [
+        "Title commit 1\n\nMessage commit 1",
+        "Title commit 2",
+        "Title commit 3\n\nFirst paragraph\n\nSecond paragraph",
+    ]
+    shas = []
+    for message in messages:
+        await utils.git("commit", "--allow-empty", "-m", message)
+        shas.append(await utils.git("rev-parse", "HEAD"))
+
+    assert await changes.get_local_commits(base_commit_sha, "main") == [
+        (shas[0], "Title commit 1", "Message commit 1"),
+        (shas[1], "Title commit 2", ""),
+        (shas[2], "Title commit 3", "First paragraph\n\nSecond paragraph"),
+    ]
@@ -0,0 +1,33 @@
+#
+#  Copyright © 2021-2024 Mergify SAS
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import pytest
+
+from mergify_cli import utils
+from mergify_cli.stack import cli as stack_cli_mod
+
+
+async def test_get_default_token_does_not_print_token_in_debug(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "supersecret123")
+
+    utils.set_debug(True)
+    try:
+        assert await stack_cli_mod.get_default_token() == "supersecret123"
+    finally:
+        utils.set_debug(False)
+
+    assert "supersecret123" not in capsys.readouterr().out
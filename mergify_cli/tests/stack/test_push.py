@@ -12,6 +12,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import collections.abc
 import json
 
 import pytest
@@ -21,6 +22,48 @@ from mergify_cli.stack import push
 from mergify_cli.tests import utils as test_utils
 
 
+# Existing pull request of a single commit stack
+SEARCH_PULL_123 = {
+    "items": [
+        {
+            "pull_request": {
+                "url": "https://api.github.com/repos/user/repo/pulls/123",
+            },
+        },
+    ],
+}
+PULL_123 = {
+    "html_url": "",
+    "number": "123",
+    "title": "Title",
+    "head": {
+        "sha": "previous_commit_sha",
+        "ref": "current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50",
+    },
+    "body": "body",
+    "state": "open",
+    "merged_at": None,
+    "draft": False,
+    "node_id": "",
+}
+PULL_123_COMMENTS = [
+    {
+        "body": "This pull request is part of a stack:\n...",
+        "url": "https://api.github.com/repos/user/repo/issues/comments/456",
+    },
+]
+
+# Stack comments expected on each pull request of a two commits stack
+STACK_COMMENT_PULL_1 = """This pull request is part of a stack:
+1. Title commit 1 ([#1](https://github.com/repo/user/pull/1)) 👈
+1. Title commit 2 ([#2](https://github.com/repo/user/pull/2))
+"""
+STACK_COMMENT_PULL_2 = """This pull request is part of a stack:
+1. Title commit 1 ([#1](https://github.com/repo/user/pull/1))
+1. Title commit 2 ([#2](https://github.com/repo/user/pull/2)) 👈
+"""
+
+
 @pytest.mark.parametrize(
     "valid_branch_name",
     [
@@ -48,7 +91,6 @@ def test_check_local_branch_invalid() -> None:
         )
 
 
-@pytest.mark.respx(base_url="https://api.github.com/")
 async def test_stack_create(
     git_mock: test_utils.GitMock,
     respx_mock: respx.MockRouter,
@@ -125,6 +167,18 @@ async def test_stack_create(
         trunk=("origin", "main"),
     )
 
+    # Both branches are pushed at once
+    assert (
+        git_mock.call_count(
+            "push",
+            "-f",
+            "origin",
+            "commit1_sha:refs/heads/current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50",
+            "commit2_sha:refs/heads/current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf51",
+        )
+        == 1
+    )
+
     # First pull request is created
     assert len(post_pull1_mock.calls) == 1
     assert json.loads(post_pull1_mock.calls.last.request.content) == {
@@ -147,26 +201,27 @@ async def test_stack_create(
 
     # First stack comment is created
     assert len(post_comment1_mock.calls) == 1
-    expected_body = """This pull request is part of a stack:
-1. Title commit 1 ([#1](https://github.com/repo/user/pull/1)) 👈
-1. Title commit 2 ([#2](https://github.com/repo/user/pull/2))
-"""
     assert json.loads(post_comment1_mock.calls.last.request.content) == {
-        "body": expected_body,
+        "body": STACK_COMMENT_PULL_1,
     }
 
     # Second stack comment is created
     assert len(post_comment2_mock.calls) == 1
-    expected_body = """This pull request is part of a stack:
-1. Title commit 1 ([#1](https://github.com/repo/user/pull/1))
-1. Title commit 2 ([#2](https://github.com/repo/user/pull/2)) 👈
-"""
     assert json.loads(post_comment2_mock.calls.last.request.content) == {
-        "body": expected_body,
+        "body": STACK_COMMENT_PULL_2,
     }
 
+    # Stack comments are written one after another, in stack order
+    assert [
+        call.request.url.path
+        for call in respx_mock.calls
+        if call.request.method == "POST" and call.request.url.path.endswith("/comments")
+    ] == [
+        "/repos/user/repo/issues/1/comments",
+        "/repos/user/repo/issues/2/comments",
+    ]
+
 
-@pytest.mark.respx(base_url="https://api.github.com/")
 async def test_stack_create_single_pull(
     git_mock: test_utils.GitMock,
     respx_mock: respx.MockRouter,
@@ -224,7 +279,6 @@ async def test_stack_create_single_pull(
     }
 
 
-@pytest.mark.respx(base_url="https://api.github.com/")
 async def test_stack_update_no_rebase(
     git_mock: test_utils.GitMock,
     respx_mock: respx.MockRouter,
@@ -242,50 +296,16 @@ async def test_stack_update_no_rebase(
     # Mock HTTP calls: the stack already exists but it's out of date, it should
     # be updated
     respx_mock.get("/user").respond(200, json={"login": "author"})
-    respx_mock.get("/search/issues").respond(
-        200,
-        json={
-            "items": [
-                {
-                    "pull_request": {
-                        "url": "https://api.github.com/repos/user/repo/pulls/123",
-                    },
-                },
-            ],
-        },
-    )
+    respx_mock.get("/search/issues").respond(200, json=SEARCH_PULL_123)
 
-    respx_mock.get(
-        "/repos/user/repo/pulls/123",
-    ).respond(
-        200,
-        json={
-            "html_url": "",
-            "number": "123",
-            "title": "Title",
-            "head": {
-                "sha": "previous_commit_sha",
-                "ref": "current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50",
-            },
-            "body": "body",
-            "state": "open",
-            "merged_at": None,
-            "draft": False,
-            "node_id": "",
-        },
-    )
+    respx_mock.get("/repos/user/repo/pulls/123").respond(200, json=PULL_123)
     patch_pull_mock = respx_mock.patch("/repos/user/repo/pulls/123").respond(
         200,
         json={},
     )
     respx_mock.get("/repos/user/repo/issues/123/comments").respond(
         200,
-        json=[
-            {
-                "body": "This pull request is part of a stack:\n...",
-                "url": "https://api.github.com/repos/user/repo/issues/comments/456",
-            },
-        ],
+        json=PULL_123_COMMENTS,
     )
     respx_mock.patch("/repos/user/repo/issues/comments/456").respond(200)
 
@@ -310,68 +330,105 @@ async def test_stack_update_no_rebase(
     }
 
 
-@pytest.mark.respx(base_url="https://api.github.com/")
-async def test_stack_update(
+async def test_stack_create_on_top_of_up_to_date_pull(
     git_mock: test_utils.GitMock,
     respx_mock: respx.MockRouter,
 ) -> None:
-    # Mock 1 commits on branch `current-branch`
+    # Mock 2 commits on branch `current-branch`, the first one already pushed
     git_mock.commit(
         test_utils.Commit(
-            sha="commit_sha",
+            sha="previous_commit_sha",
             title="Title",
             message="Message",
             change_id="I29617d37762fd69809c255d7e7073cb11f8fbf50",
         ),
+        pushed=False,
     )
-
-    # Mock HTTP calls: the stack already exists but it's out of date, it should
-    # be updated
-    respx_mock.get("/user").respond(200, json={"login": "author"})
-    respx_mock.get("/search/issues").respond(
-        200,
-        json={
-            "items": [
-                {
-                    "pull_request": {
-                        "url": "https://api.github.com/repos/user/repo/pulls/123",
-                    },
-                },
-            ],
-        },
+    git_mock.commit(
+        test_utils.Commit(
+            sha="commit2_sha",
+            title="Title commit 2",
+            message="Message commit 2",
+            change_id="I29617d37762fd69809c255d7e7073cb11f8fbf51",
+        ),
     )
 
-    respx_mock.get(
-        "/repos/user/repo/pulls/123",
-    ).respond(
+    # Mock HTTP calls: the first pull request is up to date, only the second
+    # one is created
+    respx_mock.get("/user").respond(200, json={"login": "author"})
+    respx_mock.get("/search/issues").respond(200, json=SEARCH_PULL_123)
+    respx_mock.get("/repos/user/repo/pulls/123").respond(200, json=PULL_123)
+    post_pull_mock = respx_mock.post("/repos/user/repo/pulls").respond(
         200,
         json={
-            "html_url": "",
-            "number": "123",
-            "title": "Title",
-            "head": {
-                "sha": "previous_commit_sha",
-                "ref": "current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50",
-            },
-            "body": "body",
+            "html_url": "https://github.com/repo/user/pull/2",
+            "number": "2",
+            "title": "Title commit 2",
+            "head": {"sha": "commit2_sha"},
             "state": "open",
             "merged_at": None,
             "draft": False,
             "node_id": "",
         },
     )
+    respx_mock.get("/repos/user/repo/issues/123/comments").respond(200, json=[])
+    respx_mock.post("/repos/user/repo/issues/123/comments").respond(200)
+    respx_mock.get("/repos/user/repo/issues/2/comments").respond(200, json=[])
+    respx_mock.post("/repos/user/repo/issues/2/comments").respond(200)
+
+    await push.stack_push(
+        github_server="https://api.github.com/",
+        token="",
+        skip_rebase=True,
+        next_only=False,
+        branch_prefix="",
+        dry_run=False,
+        trunk=("origin", "main"),
+    )
+
+    # Only the branch of the new pull request is pushed
+    assert (
+        git_mock.call_count(
+            "push",
+            "-f",
+            "origin",
+            "commit2_sha:refs/heads/current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf51",
+        )
+        == 1
+    )
+    assert len(post_pull_mock.calls) == 1
+    assert json.loads(post_pull_mock.calls.last.request.content)["base"] == (
+        "current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50"
+    )
+
+
+async def test_stack_update(
+    git_mock: test_utils.GitMock,
+    respx_mock: respx.MockRouter,
+) -> None:
+    # Mock 1 commits on branch `current-branch`
+    git_mock.commit(
+        test_utils.Commit(
+            sha="commit_sha",
+            title="Title",
+            message="Message",
+            change_id="I29617d37762fd69809c255d7e7073cb11f8fbf50",
+        ),
+    )
+
+    # Mock HTTP calls: the stack already exists but it's out of date, it should
+    # be updated
+    respx_mock.get("/user").respond(200, json={"login": "author"})
+    respx_mock.get("/search/issues").respond(200, json=SEARCH_PULL_123)
+
+    respx_mock.get("/repos/user/repo/pulls/123").respond(200, json=PULL_123)
     patch_pull_mock = respx_mock.patch("/repos/user/repo/pulls/123").respond(
         200,
         json={},
     )
     respx_mock.get("/repos/user/repo/issues/123/comments").respond(
         200,
-        json=[
-            {
-                "body": "This pull request is part of a stack:\n...",
-                "url": "https://api.github.com/repos/user/repo/issues/comments/456",
-            },
-        ],
+        json=PULL_123_COMMENTS,
     )
     respx_mock.patch("/repos/user/repo/issues/comments/456").respond(200)
 
@@ -384,7 +441,7 @@ async def test_stack_update(
         dry_run=False,
         trunk=("origin", "main"),
     )
-    assert git_mock.has_been_called_with("pull", "--rebase", "origin", "main")
+    assert git_mock.call_count("pull", "--rebase", "origin", "main") == 1
 
     # The pull request is updated
     assert len(patch_pull_mock.calls) == 1
@@ -396,7 +453,6 @@ async def test_stack_update(
     }
 
 
-@pytest.mark.respx(base_url="https://api.github.com/")
 async def test_stack_update_keep_title_and_body(
     git_mock: test_utils.GitMock,
     respx_mock: respx.MockRouter,
@@ -414,36 +470,10 @@ async def test_stack_update_keep_title_and_body(
     # Mock HTTP calls: the stack already exists but it's out of date, it should
     # be updated
     respx_mock.get("/user").respond(200, json={"login": "author"})
-    respx_mock.get("/search/issues").respond(
-        200,
-        json={
-            "items": [
-                {
-                    "pull_request": {
-                        "url": "https://api.github.com/repos/user/repo/pulls/123",
-                    },
-                },
-            ],
-        },
-    )
-    respx_mock.get(
-        "/repos/user/repo/pulls/123",
-    ).respond(
+    respx_mock.get("/search/issues").respond(200, json=SEARCH_PULL_123)
+    respx_mock.get("/repos/user/repo/pulls/123").respond(
         200,
-        json={
-            "html_url": "",
-            "number": "123",
-            "title": "Title",
-            "head": {
-                "sha": "previous_commit_sha",
-                "ref": "current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50",
-            },
-            "state": "open",
-            "merged_at": None,
-            "draft": False,
-            "node_id": "",
-            "body": "DONT TOUCH ME\n\nDepends-On: #12345\n",
-        },
+        json=PULL_123 | {"body": "DONT TOUCH ME\n\nDepends-On: #12345\n"},
     )
     patch_pull_mock = respx_mock.patch("/repos/user/repo/pulls/123").respond(
         200,
@@ -451,12 +481,7 @@ async def test_stack_update_keep_title_and_body(
     )
     respx_mock.get("/repos/user/repo/issues/123/comments").respond(
         200,
-        json=[
-            {
-                "body": "This pull request is part of a stack:\n...",
-                "url": "https://api.github.com/repos/user/repo/issues/comments/456",
-            },
-        ],
+        json=PULL_123_COMMENTS,
     )
     respx_mock.patch("/repos/user/repo/issues/comments/456").respond(200)
 
@@ -480,12 +505,7 @@ async def test_stack_update_keep_title_and_body(
     }
 
 
-@pytest.mark.respx(base_url="https://api.github.com/")
-async def test_stack_on_destination_branch_raises_an_error(
-    git_mock: test_utils.GitMock,
-    respx_mock: respx.MockRouter,
-) -> None:
-    respx_mock.get("/user").respond(200, json={"login": "author"})
+def _on_destination_branch(git_mock: test_utils.GitMock) -> None:
     git_mock.mock("rev-parse", "--abbrev-ref", "HEAD", output="main")
     git_mock.mock(
         "remote",
@@ -494,25 +514,32 @@ async def test_stack_on_destination_branch_raises_an_error(
         output="https://github.com/foo/bar.git",
     )
 
-    with pytest.raises(SystemExit, match="1"):
-        await push.stack_push(
-            github_server="https://api.github.com/",
-            token="",
-            skip_rebase=False,
-            next_only=False,
-            branch_prefix="",
-            dry_run=False,
-            trunk=("origin", "main"),
-        )
+
+def _on_generated_branch(git_mock: test_utils.GitMock) -> None:
+    git_mock.mock(
+        "rev-parse",
+        "--abbrev-ref",
+        "HEAD",
+        output="current-branch/I29617d37762fd69809c255d7e7073cb11f8fbf50",
+    )
+
+
+def _without_common_commit(git_mock: test_utils.GitMock) -> None:
+    git_mock.mock("merge-base", "--fork-point", "origin/main", output="")
 
 
-@pytest.mark.respx(base_url="https://api.github.com/")
-async def test_stack_without_common_commit_raises_an_error(
+@pytest.mark.parametrize(
+    "setup_git_mock",
+    [_on_destination_branch, _on_generated_branch, _without_common_commit],
+    ids=["on_destination_branch", "on_generated_branch", "without_common_commit"],
+)
+async def test_stack_push_raises_an_error(
     git_mock: test_utils.GitMock,
     respx_mock: respx.MockRouter,
+    setup_git_mock: collections.abc.Callable[[test_utils.GitMock], None],
 ) -> None:
     respx_mock.get("/user").respond(200, json={"login": "author"})
-    git_mock.mock("merge-base", "--fork-point", "origin/main", output="")
+    setup_git_mock(git_mock)
 
     with pytest.raises(SystemExit, match="1"):
         await push.stack_push(
@@ -43,11 +43,37 @@ async def test_get_trunk() -> None:
 
 
 @pytest.mark.parametrize(
-    ("default_arg_fct", "config_get_result", "expected_default"),
+    "url",
+    [
+        "https://github.com/user/repo",
+        "https://github.com/user/repo.git",
+        "https://github.com/user/repo/",
+        "ssh://git@github.com/user/repo.git",
+        "git@github.com:user/repo.git",
+        "git@github.com:user/repo",
+    ],
+)
+def test_get_slug(url: str) -> None:
+    assert utils.get_slug(url) == ("user", "repo")
+
+
+def test_command_error_with_undecodable_output() -> None:
+    error = utils.CommandError(("git", "log"), 128, b"fatal: \xff")
+    assert str(error) == "failed to run `git log`: fatal: \ufffd"
+
+
+@pytest.mark.parametrize(
+    ("default_arg_fct", "config_key", "config_value", "expected_default"),
     [
-        (utils.get_default_keep_pr_title_body, "true", True),
+        (
+            utils.get_default_keep_pr_title_body,
+            "mergify-cli.stack-keep-pr-title-body",
+            "true",
+            True,
+        ),
         (
             lambda: utils.get_default_branch_prefix("author"),
+            "mergify-cli.stack-branch-prefix",
             "dummy-prefix",
             "dummy-prefix",
         ),
@@ -58,8 +84,41 @@ async def test_defaults_config_args_set(
         [],
         collections.abc.Awaitable[bool | str],
     ],
-    config_get_result: bytes,
+    config_key: str,
+    config_value: str,
     expected_default: bool,
 ) -> None:
-    with mock.patch.object(utils, "run_command", return_value=config_get_result):
+    with mock.patch.object(
+        utils,
+        "run_command",
+        return_value=f"{config_key}\n{config_value}\0",
+    ):
         assert (await default_arg_fct()) == expected_default
+
+
+@pytest.mark.usefixtures("_git_repo")
+async def test_get_config_is_loaded_once() -> None:
+    with mock.patch.object(
+        utils,
+        "run_command",
+        wraps=utils.run_command,
+    ) as run_command:
+        assert await utils.git_get_config_value("branch.main.remote") == "origin"
+        assert (
+            await utils.git_get_config_value("branch.main.merge") == "refs/heads/main"
+        )
+        with pytest.raises(utils.CommandError):
+            await utils.git_get_config_value("mergify-cli.unknown")
+
+    run_command.assert_called_once_with("git", "config", "--list", "-z")
+
+
+@pytest.mark.usefixtures("_git_repo")
+async def test_clear_git_config_cache() -> None:
+    assert await utils.git_get_target_remote("main") == "origin"
+
+    await utils.git("config", "branch.main.remote", "upstream")
+    assert await utils.git_get_target_remote("main") == "origin"
+
+    utils.clear_git_config_cache()
+    assert await utils.git_get_target_remote("main") == "upstream"
@@ -12,10 +12,34 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import collections
+import copy
 import dataclasses
 import typing
 
 
+_CONFIG_LIST_ARGS = ("config", "--list", "-z")
+# List of commit SHAs, titles and messages of the stack
+_COMMITS_LOG_ARGS = (
+    "log",
+    "--reverse",
+    "--format=%H%x00%s%x00%b%x1e",
+    "base_commit_sha..current-branch",
+)
+
+# Configuration and commands mocked by default_cli_args()
+_DEFAULT_CONFIG = {
+    "mergify-cli.github-server": "",
+    "mergify-cli.stack-keep-pr-title-body": "",
+    "branch.current-branch.merge": "",
+    "branch.current-branch.remote": "",
+    "mergify-cli.stack-branch-prefix": "",
+}
+_DEFAULT_MOCKS: dict[tuple[str, ...], str] = {
+    ("merge-base", "--fork-point", "origin/main"): "",
+}
+
+
 class Commit(typing.TypedDict):
     sha: str
     title: str
@@ -29,59 +53,85 @@ class GitMock:
         init=False,
         default_factory=dict,
     )
+    _config: dict[str, str] = dataclasses.field(init=False, default_factory=dict)
     _commits: list[Commit] = dataclasses.field(init=False, default_factory=list)
-    _called: list[tuple[str, ...]] = dataclasses.field(init=False, default_factory=list)
+    _pushed_commits: list[Commit] = dataclasses.field(
+        init=False,
+        default_factory=list,
+    )
+    _called: collections.Counter[tuple[str, ...]] = dataclasses.field(
+        init=False,
+        default_factory=collections.Counter,
+    )
+
+    def clone(self) -> "GitMock":
+        return copy.deepcopy(self)
 
     def mock(self, *args: str, output: str) -> None:
         self._mocked[args] = output
 
+    def mock_config(self, config: dict[str, str]) -> None:
+        self._config.update(config)
+
+    def mock_many(self, mocks: dict[tuple[str, ...], str]) -> None:
+        self._mocked.update(mocks)
+
     def has_been_called_with(self, *args: str) -> bool:
         return args in self._called
 
+    def call_count(self, *args: str) -> int:
+        return self._called[args]
+
     async def __call__(self, *args: str) -> str:
-        if args in self._mocked:
-            self._called.append(args)
-            return self._mocked[args]
+        if args == _CONFIG_LIST_ARGS:
+            self._called[args] += 1
+            return "".join(f"{key}\n{value}\0" for key, value in self._config.items())
 
-        msg = f"git_mock called with `{args}`, not mocked!"
-        raise AssertionError(msg)
+        if args == _COMMITS_LOG_ARGS and self._commits:
+            self._called[args] += 1
+            return self._commits_log()
 
-    def default_cli_args(self) -> None:
-        self.mock("config", "--get", "mergify-cli.github-server", output="")
-        self.mock("config", "--get", "mergify-cli.stack-keep-pr-title-body", output="")
-        self.mock("config", "--get", "branch.current-branch.merge", output="")
-        self.mock("config", "--get", "branch.current-branch.remote", output="")
-        self.mock("config", "--get", "mergify-cli.stack-branch-prefix", output="")
-        self.mock("merge-base", "--fork-point", "origin/main", output="")
-
-    def commit(self, commit: Commit) -> None:
-        self._commits.append(commit)
+        if args == self._commits_push_args() and self._pushed_commits:
+            self._called[args] += 1
+            return ""
 
-        # Base commit SHA
-        self.mock("merge-base", "--fork-point", "origin/main", output="base_commit_sha")
-        # Commit message
-        self.mock(
-            "log",
-            "-1",
-            "--format=%b",
-            commit["sha"],
-            output=f"{commit['message']}\n\nChange-Id: {commit['change_id']}",
-        )
-        # Commit title
-        self.mock("log", "-1", "--format=%s", commit["sha"], output=commit["title"])
-        # List of commit SHAs
-        self.mock(
-            "log",
-            "--format=%H",
-            "base_commit_sha..current-branch",
-            output="\n".join(c["sha"] for c in reversed(self._commits)),
+        output = self._mocked.get(args)
+        if output is None:
+            msg = f"git_mock called with `{args}`, not mocked!"
+            raise AssertionError(msg)
+
+        self._called[args] += 1
+        return output
+
+    def _commits_log(self) -> str:
+        # NOTE: built on call rather than on each commit() to keep the setup
+        # of large stacks linear
+        return "\n".join(
+            f"{c['sha']}\x00{c['title']}\x00{c['message']}\n\nChange-Id: {c['change_id']}\x1e"
+            for c in self._commits
         )
-        self.mock("branch", "mergify-cli-tmp", commit["sha"], output="")
-        self.mock("branch", "-D", "mergify-cli-tmp", output="")
-        self.mock(
+
+    def _commits_push_args(self) -> tuple[str, ...]:
+        # All the stacked branches are pushed with a single command
+        return (
             "push",
             "-f",
             "origin",
-            f"mergify-cli-tmp:current-branch/{commit['change_id']}",
-            output="",
+            *(
+                f"{c['sha']}:refs/heads/current-branch/{c['change_id']}"
+                for c in self._pushed_commits
+            ),
         )
+
+    def default_cli_args(self) -> None:
+        self._config.update(_DEFAULT_CONFIG)
+        self._mocked.update(_DEFAULT_MOCKS)
+
+    def commit(self, commit: Commit, *, pushed: bool = True) -> None:
+        # `pushed` is False for commits whose stacked branch is up to date
+        self._commits.append(commit)
+        if pushed:
+            self._pushed_commits.append(commit)
+
+        # Base commit SHA
+        self.mock("merge-base", "--fork-point", "origin/main", output="base_commit_sha")
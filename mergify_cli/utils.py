@@ -20,7 +20,6 @@ import dataclasses
 import functools
 import sys
 import typing
-from urllib import parse
 
 import httpx
 
@@ -28,6 +27,14 @@ from mergify_cli import VERSION
 from mergify_cli import console
 
 
+try:
+    import uvloop
+except ImportError:
+    HAS_UVLOOP = False
+else:
+    HAS_UVLOOP = True
+
+
 if typing.TYPE_CHECKING:
     from collections.abc import Callable
     from collections.abc import Coroutine
@@ -37,9 +44,23 @@ if typing.TYPE_CHECKING:
 _DEBUG = False
 
 
+def _log_command(args: tuple[str, ...]) -> None:
+    console.print(f"[purple]DEBUG: running: {' '.join(args)} [/]")
+
+
+def _do_not_log_command(args: tuple[str, ...]) -> None:
+    pass
+
+
+# NOTE: bound once by set_debug() so run_command doesn't check the debug flag
+# on each call
+_debug_log_command = _do_not_log_command
+
+
 def set_debug(debug: bool) -> None:
-    global _DEBUG  # noqa: PLW0603
+    global _DEBUG, _debug_log_command  # noqa: PLW0603
     _DEBUG = debug
+    _debug_log_command = _log_command if debug else _do_not_log_command
 
 
 def is_debug() -> bool:
@@ -76,12 +97,12 @@ class CommandError(Exception):
     stdout: bytes
 
     def __str__(self) -> str:
-        return f"failed to run `{' '.join(self.command_args)}`: {self.stdout.decode()}"
+        output = self.stdout.decode(errors="replace")
+        return f"failed to run `{' '.join(self.command_args)}`: {output}"
 
 
 async def run_command(*args: str) -> str:
-    if is_debug():
-        console.print(f"[purple]DEBUG: running: git {' '.join(args)} [/]")
+    _debug_log_command(args)
     proc = await asyncio.create_subprocess_exec(
         *args,
         stdout=asyncio.subprocess.PIPE,
@@ -101,19 +122,51 @@ async def git_get_branch_name() -> str:
     return await git("rev-parse", "--abbrev-ref", "HEAD")
 
 
+_GIT_CONFIG: dict[str, str] | None = None
+
+
+def clear_git_config_cache() -> None:
+    global _GIT_CONFIG  # noqa: PLW0603
+    _GIT_CONFIG = None
+
+
+async def git_get_config() -> dict[str, str]:
+    # NOTE: the whole configuration is loaded once, so every lookup done
+    # afterward doesn't spawn a git process. Code changing the configuration
+    # must call clear_git_config_cache() afterward.
+    global _GIT_CONFIG  # noqa: PLW0603
+    if _GIT_CONFIG is None:
+        config = {}
+        for entry in (await git("config", "--list", "-z")).split("\0"):
+            if entry:
+                key, _, value = entry.partition("\n")
+                config[key] = value
+        _GIT_CONFIG = config
+    return _GIT_CONFIG
+
+
+async def git_get_config_value(key: str) -> str:
+    config = await git_get_config()
+    try:
+        return config[key]
+    except KeyError:
+        # Behave like `git config --get` on a missing key
+        raise CommandError(("git", "config", "--get", key), 1, b"") from None
+
+
 async def git_get_target_branch(branch: str) -> str:
-    return (await git("config", "--get", "branch." + branch + ".merge")).removeprefix(
+    return (await git_get_config_value(f"branch.{branch}.merge")).removeprefix(
         "refs/heads/",
     )
 
 
 async def git_get_target_remote(branch: str) -> str:
-    return await git("config", "--get", "branch." + branch + ".remote")
+    return await git_get_config_value(f"branch.{branch}.remote")
 
 
 async def get_default_branch_prefix(author: str) -> str:
     try:
-        result = await git("config", "--get", "mergify-cli.stack-branch-prefix")
+        result = await git_get_config_value("mergify-cli.stack-branch-prefix")
     except CommandError:
         result = ""
 
@@ -122,11 +175,7 @@ async def get_default_branch_prefix(author: str) -> str:
 
 async def get_default_keep_pr_title_body() -> bool:
     try:
-        result = await git(
-            "config",
-            "--get",
-            "mergify-cli.stack-keep-pr-title-body",
-        )
+        result = await git_get_config_value("mergify-cli.stack-keep-pr-title-body")
     except CommandError:
         return False
 
@@ -161,13 +210,17 @@ async def get_trunk() -> str:
     return f"{target_remote}/{target_branch}"
 
 
+@functools.lru_cache(maxsize=32)
 def get_slug(url: str) -> tuple[str, str]:
-    parsed = parse.urlparse(url)
-    if not parsed.netloc:
-        # Probably ssh
-        _, _, path = parsed.path.partition(":")
+    # NOTE: remote URLs are simple enough to not need urllib.parse
+    if "://" in url:
+        # e.g. https://github.com/user/repo.git
+        _, _, location = url.partition("://")
+        _, _, path = location.partition("/")
+        path = path.rstrip("/")
     else:
-        path = parsed.path[1:].rstrip("/")
+        # Probably ssh, e.g. git@github.com:user/repo.git
+        _, _, path = url.partition(":")
 
     user, repo = path.split("/", 1)
     repo = repo.removesuffix(".git")
@@ -226,9 +279,6 @@ def get_github_http_client(github_server: str, token: str) -> httpx.AsyncClient:
         "request": [],
         "response": [check_for_status],
     }
-    if is_debug():
-        event_hooks["request"].insert(0, log_httpx_request)
-        event_hooks["response"].insert(0, log_httpx_response)
 
     return get_http_client(
         github_server,
@@ -245,6 +295,15 @@ P = typing.ParamSpec("P")
 R = typing.TypeVar("R")
 
 
+def run_coroutine(coro: Coroutine[typing.Any, typing.Any, R]) -> R:
+    # NOTE: the CLI mostly waits on git subprocesses, which uvloop spawns
+    # faster than the default event loop. uvloop.run() creates its loop
+    # directly instead of going through the deprecated event loop policies.
+    if HAS_UVLOOP:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
 def run_with_asyncio(
     func: Callable[
         P,
@@ -259,6 +318,6 @@ def run_with_asyncio(
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
         result = func(*args, **kwargs)
-        return asyncio.run(result)
+        return run_coroutine(result)
 
     return wrapper